@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK FORMATS D'ARTEFACTS MODÈLE
+====================================
+Compare le pickle historique (dict complet en un bloc) à l'artefact sectionné
+(ModelArtifactStore) selon la compression de la section estimateur: taille sur disque,
+temps d'écriture, chargement à froid (processus neuf) et lecture des seules métadonnées.
+Données synthétiques, aucune dépendance réseau.
+"""
+
+import os
+import sys
+import time
+import pickle
+import argparse
+import logging
+import tempfile
+import subprocess
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier, HistGradientBoostingClassifier
+from ultra_sophisticated_ml_system import (ModelArtifactStore, FeaturePreprocessor, WeightedSoftVotingEnsemble,
+                                           CalibratedEnsemble, make_probability_calibrator, MODEL_ARTIFACT_SUFFIX)
+
+# Configuration logging sans émojis
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Chargement mesuré dans un processus neuf (imports exclus du chrono)
+COLD_LOAD_SCRIPT = """
+import sys, time, pickle
+from ultra_sophisticated_ml_system import ModelArtifactStore
+path, mode = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+if mode == 'pickle':
+    with open(path, 'rb') as f:
+        pickle.load(f)
+elif mode == 'metadata':
+    ModelArtifactStore.read_metadata(path)
+else:
+    ModelArtifactStore.load(path)
+print(time.perf_counter() - start)
+"""
+
+def make_model(n_matches: int, n_features: int, seed: int = 42):
+    """Ensemble calibré proche de la production (forêts + boosting) sur données synthétiques"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_matches, n_features))
+    y = np.where(X[:, 0] - X[:, 1] + rng.normal(scale=0.8, size=n_matches) > 0.4, 2,
+                 np.where(X[:, 0] - X[:, 1] < -0.4, 0, 1))
+
+    preprocessor = FeaturePreprocessor().fit(X)
+    X_processed = preprocessor.transform(X)
+    estimators = [
+        ('random_forest', RandomForestClassifier(n_estimators=500, max_depth=15, min_samples_leaf=5,
+                                                 random_state=seed, n_jobs=-1)),
+        ('extra_trees', ExtraTreesClassifier(n_estimators=500, max_depth=12, random_state=seed, n_jobs=-1)),
+        ('gradient_boosting', HistGradientBoostingClassifier(max_iter=200, max_depth=10, random_state=seed))
+    ]
+    for _, estimator in estimators:
+        estimator.fit(X_processed, y)
+
+    ensemble = WeightedSoftVotingEnsemble(estimators, [1 / 3] * 3, classes=np.arange(3))
+    calibrator = make_probability_calibrator('isotonic').fit(ensemble.predict_proba(X_processed), y)
+
+    return CalibratedEnsemble(ensemble, calibrator), preprocessor, [f'feature_{i}' for i in range(n_features)]
+
+def cold_load_seconds(path: str, mode: str, repeats: int, workdir: str) -> float:
+    """Médiane des temps de chargement, chaque essai dans un processus neuf"""
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    timings = [
+        float(subprocess.run([sys.executable, '-c', COLD_LOAD_SCRIPT, path, mode], cwd=workdir, env=env,
+                             capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1])
+        for _ in range(repeats)
+    ]
+    return float(np.median(timings))
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Benchmark formats d'artefacts modele")
+    parser.add_argument('--matches', type=int, default=5000, help='Nombre de matches synthétiques')
+    parser.add_argument('--features', type=int, default=60, help='Nombre de features')
+    parser.add_argument('--repeats', type=int, default=3, help='Chargements à froid par format')
+
+    args = parser.parse_args()
+
+    model, preprocessor, feature_names = make_model(args.matches, args.features)
+    metadata = {'timestamp': 'benchmark', 'system_version': '1.0-ultra-sophisticated',
+                'performance_metrics': {'final_accuracy': 0.55}}
+    logger.info(f"Modele: 1000 arbres de foret + 200 iterations de boosting, {args.features} features")
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # Pickle historique: dict complet en un bloc
+        path = os.path.join(workdir, 'model_legacy.pkl')
+        start = time.perf_counter()
+        with open(path, 'wb') as f:
+            pickle.dump({'model': model, 'preprocessor': preprocessor, 'feature_names': feature_names,
+                         **metadata}, f)
+        results.append({'format': 'pickle', 'bytes': os.path.getsize(path),
+                        'save_seconds': time.perf_counter() - start,
+                        'load_seconds': cold_load_seconds(path, 'pickle', args.repeats, workdir),
+                        'metadata_seconds': None})
+
+        # Artefact sectionné, compression de l'estimateur variable
+        for compression in ModelArtifactStore.COMPRESSION:
+            path = os.path.join(workdir, f'model_{compression}{MODEL_ARTIFACT_SUFFIX}')
+            start = time.perf_counter()
+            ModelArtifactStore.save(path, {'metadata': metadata, 'feature_names': feature_names,
+                                           'estimator': model, 'preprocessing': preprocessor},
+                                    {'estimator': compression})
+            results.append({'format': f'sections/{compression}', 'bytes': os.path.getsize(path),
+                            'save_seconds': time.perf_counter() - start,
+                            'load_seconds': cold_load_seconds(path, 'load', args.repeats, workdir),
+                            'metadata_seconds': cold_load_seconds(path, 'metadata', args.repeats, workdir)})
+
+    print(f"{'format':<18} {'taille (Mo)':>12} {'ecriture (s)':>13} {'chargement (s)':>15} {'metadonnees (s)':>16}")
+    for r in results:
+        metadata_seconds = f"{r['metadata_seconds']:.4f}" if r['metadata_seconds'] is not None else '-'
+        print(f"{r['format']:<18} {r['bytes'] / 1e6:>12.2f} {r['save_seconds']:>13.2f} "
+              f"{r['load_seconds']:>15.3f} {metadata_seconds:>16}")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK MÉMOIRE DE LA MATRICE D'ENTRAÎNEMENT
+==============================================
+Pic mémoire (tracemalloc) et durée de la préparation + entraînement d'une forêt:
+- 'legacy': représentation précédente (float64 / object, copie du frame à chaque
+  étape d'engineering, interactions float64, préprocessing float64)
+- 'compact': compact_training_frame (float32, int32, catégories), engineering en place,
+  préprocessing float32 imputé et normalisé en place
+Données synthétiques, aucune dépendance réseau.
+"""
+
+import sys
+import time
+import argparse
+import logging
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import ExtraTreesClassifier
+from ultra_sophisticated_ml_system import MLConfig, AdvancedFeatureEngineer, FeaturePreprocessor
+
+# Configuration logging sans émojis
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def make_consolidated_matches(n_matches: int, n_features: int, seed: int = 42) -> pd.DataFrame:
+    """Frame consolidé type (avant compaction): float64, int64 et chaînes"""
+    rng = np.random.default_rng(seed)
+    teams = np.array([f'Team {i}' for i in range(40)])
+    dates = pd.Timestamp('2015-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 3650, n_matches)), unit='D')
+
+    df = pd.DataFrame({
+        'match_id': np.arange(n_matches, dtype=np.int64),
+        'date': dates.strftime('%Y-%m-%dT%H:%M:%S'),
+        'match_date': dates.strftime('%Y-%m-%d'),
+        'home_team': teams[rng.integers(0, 40, n_matches)],
+        'away_team': teams[rng.integers(0, 40, n_matches)],
+        'home_team_id': rng.integers(1, 41, n_matches).astype(np.int64),
+        'away_team_id': rng.integers(1, 41, n_matches).astype(np.int64),
+        'result': rng.choice(['home', 'draw', 'away'], n_matches, p=[0.45, 0.27, 0.28]).astype(object)
+    })
+    features = rng.normal(size=(n_matches, n_features))
+    features[rng.random(features.shape) < 0.05] = np.nan
+    for i in range(n_features):
+        df[f'stat_{i}'] = features[:, i]
+    return df.astype({col: object for col in ('date', 'match_date', 'home_team', 'away_team')})
+
+def legacy_pipeline(df: pd.DataFrame, engineer: AdvancedFeatureEngineer) -> tuple:
+    """Représentation précédente: copies par étape, float64 partout"""
+    df = engineer.create_temporal_features(df.copy())
+    before = set(df.columns)
+    df = engineer.create_interaction_features(df.copy())
+    for col in set(df.columns) - before:
+        df[col] = df[col].astype(np.float64)
+    return df, FeaturePreprocessor(dtype=np.float64)
+
+def compact_pipeline(df: pd.DataFrame, engineer: AdvancedFeatureEngineer) -> tuple:
+    """Représentation compacte: float32 / int32 / catégories, engineering en place"""
+    df = engineer.compact_training_frame(df)
+    df = engineer.create_temporal_features(df)
+    df = engineer.create_interaction_features(df)
+    return df, FeaturePreprocessor()
+
+def run(variant: str, n_matches: int, n_features: int) -> dict:
+    engineer = AdvancedFeatureEngineer(MLConfig())
+    df = make_consolidated_matches(n_matches, n_features)
+
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    pipeline = legacy_pipeline if variant == 'legacy' else compact_pipeline
+    df, preprocessor = pipeline(df, engineer)
+    features = df.drop(columns=['result', 'match_id', 'home_team', 'away_team'])
+    X = preprocessor.fit_transform(features)
+    y = df['result'].astype(str).to_numpy()
+
+    ExtraTreesClassifier(n_estimators=20, max_depth=10, random_state=42).fit(X, y)
+
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+
+    return {
+        'variant': variant,
+        'frame_mb': df.memory_usage(deep=True).sum() / 1e6,
+        'matrix_mb': X.nbytes / 1e6,
+        'peak_mb': (peak - baseline) / 1e6,
+        'seconds': seconds
+    }
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Benchmark memoire de la matrice d'entrainement")
+    parser.add_argument('--matches', type=int, default=100000, help='Nombre de matches synthétiques')
+    parser.add_argument('--features', type=int, default=40, help='Nombre de features numériques')
+
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    results = [run(variant, args.matches, args.features) for variant in ('legacy', 'compact')]
+    tracemalloc.stop()
+
+    print(f"{'variante':<10} {'frame (Mo)':>11} {'matrice (Mo)':>13} {'pic (Mo)':>10} {'duree (s)':>10}")
+    for r in results:
+        print(f"{r['variant']:<10} {r['frame_mb']:>11.1f} {r['matrix_mb']:>13.1f} "
+              f"{r['peak_mb']:>10.1f} {r['seconds']:>10.2f}")
+
+    reduction = 1 - results[1]['peak_mb'] / max(results[0]['peak_mb'], 1e-9)
+    print(f"Reduction du pic memoire: {reduction:.0%}")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,9 +6,14 @@ Utilise l'Ultra Sophisticated ML System avec toutes les features riches
 
 import os
 import sys
+import json
+import time
 import argparse
+import socket
+import uuid
 import logging
 from datetime import datetime
+from typing import Dict, Optional
 
 # Configuration logging sans émojis
 logging.basicConfig(
@@ -24,6 +29,11 @@ logger = logging.getLogger(__name__)
 # Import du système ultra sophistiqué
 from ultra_sophisticated_ml_system import UltraSophisticatedMLSystem, MLConfig
 
+# Coalescing des rafraichissements concurrents (single-flight)
+REFRESH_WAIT_TIMEOUT_SECONDS = 20 * 60
+REFRESH_STALE_LOCK_SECONDS = 30 * 60
+REFRESH_POLL_SECONDS = 1.0
+
 def generate_predictions_for_api(matches_limit: int = 40) -> bool:
     """
     Génère prédictions sophistiquées et les sauve en cache pour l'API
@@ -40,15 +50,14 @@ def generate_predictions_for_api(matches_limit: int = 40) -> bool:
         system = UltraSophisticatedMLSystem(config)
         
         # Vérifier si modèle existe déjà
-        model_files = [f for f in os.listdir('.') if f.endswith('.pkl') and 'usualodds' in f]
+        model_files = [f for f in os.listdir('.') if f.endswith(('.uomodel', '.pkl'))
+                       and 'usualodds' in f and not f.startswith('archive_')]
         
         if model_files:
             logger.info(f"Modele trouve: {model_files[0]}")
             # Charger modèle existant si possible
             try:
-                import pickle
-                with open(model_files[0], 'rb') as f:
-                    system.final_model = pickle.load(f)
+                system.load_model(model_files[0])
                 logger.info("Modele charge avec succes")
             except Exception as e:
                 logger.warning(f"Impossible de charger modele: {e}")
@@ -72,6 +81,11 @@ def generate_predictions_for_api(matches_limit: int = 40) -> bool:
         # Sauvegarde cache de backup
         system.save_predictions_cache(predictions, 'backup_latest')
         
+        # Publication dans le store partagé Supabase
+        store_report = system.save_predictions_to_store(predictions)
+        logger.info(f"Store ai_predictions_upcoming: {store_report.get('rows_written', 0)} ecrites, "
+                   f"{store_report.get('rows_skipped', 0)} inchangees")
+        
         # Statistiques
         logger.info(f"=== RESULTATS ===")
         logger.info(f"Predictions generees: {len(predictions)}")
@@ -95,6 +109,154 @@ def generate_predictions_for_api(matches_limit: int = 40) -> bool:
         logger.error(f"Erreur generation predictions: {e}")
         return False
 
+def _slate_key(matches_limit: int) -> str:
+    """Identifiant du lot de matches a rafraichir"""
+    return f"upcoming_{matches_limit}"
+
+def _acquire_refresh_lock(lock_path: str) -> Optional[str]:
+    """Tente de prendre le verrou de rafraichissement (creation atomique); retourne le jeton du proprietaire"""
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return None
+    
+    token = uuid.uuid4().hex
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'pid': os.getpid(), 'host': socket.gethostname(), 'token': token,
+                   'started_at': time.time()}, f)
+    
+    return token
+
+def _read_lock_owner(lock_path: str) -> Optional[Dict]:
+    """Proprietaire du verrou (None si absent ou en cours d'ecriture)"""
+    try:
+        with open(lock_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _release_refresh_lock(lock_path: str, token: str) -> bool:
+    """
+    Libere le verrou seulement s'il porte le jeton attendu.
+    Le verrou est d'abord renomme (atomique) puis verifie: un verrou repris par
+    un autre processus entre-temps est remis en place au lieu d'etre supprime.
+    """
+    claimed_path = f"{lock_path}.{uuid.uuid4().hex}.release"
+    try:
+        os.rename(lock_path, claimed_path)
+    except FileNotFoundError:
+        return False
+    
+    owner = _read_lock_owner(claimed_path) or {}
+    if owner.get('token', '') == token:
+        os.remove(claimed_path)
+        return True
+    
+    try:
+        os.link(claimed_path, lock_path)
+    except FileExistsError:
+        pass
+    os.remove(claimed_path)
+    return False
+
+def _pid_alive(pid: int) -> Optional[bool]:
+    """Processus local vivant (None si indeterminable sur cette plateforme)"""
+    if os.name == 'nt':
+        # os.kill(pid, 0) termine le processus sous Windows
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _stale_lock_token(lock_path: str) -> Optional[str]:
+    """
+    Jeton d'un verrou abandonne ('' si illisible, None si le verrou est actif ou absent).
+    Abandonne = processus proprietaire mort sur cette machine; l'anciennete ne sert
+    que si le proprietaire est inconnu (autre machine, plateforme, verrou illisible).
+    """
+    owner = _read_lock_owner(lock_path)
+    if owner is not None and owner.get('host') == socket.gethostname():
+        alive = _pid_alive(int(owner.get('pid', 0)))
+        if alive is not None:
+            return None if alive else owner.get('token', '')
+    
+    try:
+        age = time.time() - os.path.getmtime(lock_path)
+    except FileNotFoundError:
+        return None
+    if age <= REFRESH_STALE_LOCK_SECONDS:
+        return None
+    return (owner or {}).get('token', '')
+
+def _write_refresh_result(result_path: str, success: bool):
+    """Publie le resultat du rafraichissement pour les requetes en attente"""
+    tmp_path = f"{result_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'success': success, 'finished_at': time.time(), 'pid': os.getpid()}, f)
+    os.replace(tmp_path, result_path)
+
+def _read_refresh_result(result_path: str) -> Optional[Dict]:
+    """Lit le dernier resultat publie (None si absent ou illisible)"""
+    try:
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def generate_predictions_coalesced(matches_limit: int = 40,
+                                   wait_timeout: float = REFRESH_WAIT_TIMEOUT_SECONDS) -> bool:
+    """
+    Rafraichissement single-flight entre processus via fichier verrou.
+    
+    Le premier appel pour un lot prend le verrou et calcule les predictions;
+    les appels concurrents attendent la liberation du verrou et reutilisent
+    le resultat publie au lieu de relancer extraction et scoring.
+    """
+    slate = _slate_key(matches_limit)
+    lock_path = f'predictions_refresh_{slate}.lock'
+    result_path = f'predictions_refresh_{slate}.result.json'
+    
+    requested_at = time.time()
+    deadline = requested_at + wait_timeout
+    waiting_logged = False
+    
+    while True:
+        # Un rafraichissement termine apres notre requete couvre deja celle-ci
+        result = _read_refresh_result(result_path)
+        if result and result.get('finished_at', 0) >= requested_at:
+            logger.info(f"Resultat partage reutilise pour {slate} (pid {result.get('pid')})")
+            return bool(result.get('success'))
+        
+        token = _acquire_refresh_lock(lock_path)
+        if token:
+            try:
+                success = generate_predictions_for_api(matches_limit)
+                _write_refresh_result(result_path, success)
+                return success
+            finally:
+                _release_refresh_lock(lock_path, token)
+        
+        if os.path.exists(lock_path):
+            stale_token = _stale_lock_token(lock_path)
+            if stale_token is not None:
+                logger.warning(f"Verrou abandonne detecte, suppression: {lock_path}")
+                _release_refresh_lock(lock_path, stale_token)
+                continue
+            
+            if time.time() > deadline:
+                logger.error(f"Timeout attente rafraichissement en cours ({slate})")
+                return False
+            
+            if not waiting_logged:
+                logger.info(f"Rafraichissement deja en cours pour {slate}, attente du resultat...")
+                waiting_logged = True
+            
+            time.sleep(REFRESH_POLL_SECONDS)
+
 def main():
     """Point d'entrée principal"""
     parser = argparse.ArgumentParser(description='Générateur de prédictions sophistiquées')
@@ -102,6 +264,10 @@ def main():
                        help='Nombre de matches à prédire (défaut: 40)')
     parser.add_argument('--verbose', action='store_true',
                        help='Mode verbose')
+    parser.add_argument('--wait-timeout', type=float, default=REFRESH_WAIT_TIMEOUT_SECONDS,
+                       help='Attente max (s) d\'un rafraichissement deja en cours')
+    parser.add_argument('--no-coalesce', action='store_true',
+                       help='Desactive le partage des rafraichissements concurrents')
     
     args = parser.parse_args()
     
@@ -114,7 +280,10 @@ def main():
         print(f"Demarrage: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print()
         
-        success = generate_predictions_for_api(args.matches)
+        if args.no_coalesce:
+            success = generate_predictions_for_api(args.matches)
+        else:
+            success = generate_predictions_coalesced(args.matches, args.wait_timeout)
         
         print("\n" + "=" * 60)
         if success:
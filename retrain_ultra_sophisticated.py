@@ -8,8 +8,10 @@ Améliore le modèle en continu avec les données fraîches
 
 import os
 import sys
+import shutil
 import argparse
 import logging
+import numpy as np
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -26,11 +28,12 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-def continuous_learning_pipeline(new_results_count: int = 0):
+def continuous_learning_pipeline(new_results_count: int = 0, full_rebuild: bool = False):
     """
     Pipeline d'apprentissage continu
     1. Charge les nouveaux résultats depuis Supabase
-    2. Réentraîne le modèle avec les données fraîches
+    2. Met à jour le modèle à chaud avec les seuls nouveaux résultats
+       (reconstruction complète réservée au job planifié: --full-rebuild)
     3. Valide la performance
     4. Déploie le nouveau modèle si amélioration
     """
@@ -49,7 +52,8 @@ def continuous_learning_pipeline(new_results_count: int = 0):
         system = UltraSophisticatedMLSystem(config)
         
         # Charger modèle existant
-        model_files = [f for f in os.listdir('.') if f.endswith('.pkl') and 'usualodds' in f]
+        model_files = [f for f in os.listdir('.') if f.endswith(('.uomodel', '.pkl'))
+                       and 'usualodds' in f and not f.startswith('archive_')]
         current_model_path = None
         
         if model_files:
@@ -58,14 +62,16 @@ def continuous_learning_pipeline(new_results_count: int = 0):
             
             # Charger le modèle existant
             try:
-                import pickle
-                with open(current_model_path, 'rb') as f:
-                    system.final_model = pickle.load(f)
+                system.load_model(current_model_path)
                 logger.info("Modele actuel charge avec succes")
             except Exception as e:
                 logger.warning(f"Impossible de charger modele actuel: {e}")
                 current_model_path = None
         
+        # Mise à jour incrémentale: seuls les matches terminés depuis le watermark du modèle
+        if not full_rebuild and system.can_update_incrementally():
+            return incremental_learning_pipeline(system, current_model_path)
+        
         # Vérifier s'il y a assez de nouveaux résultats pour re-entraîner
         min_results_for_retrain = 10
         if new_results_count < min_results_for_retrain:
@@ -111,37 +117,7 @@ def continuous_learning_pipeline(new_results_count: int = 0):
             logger.info("Pas d'amelioration significative, conservation modele actuel")
         
         if should_deploy:
-            # Sauvegarder nouveau modèle
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            new_model_path = f'usualodds_model_retrained_{timestamp}.pkl'
-            
-            try:
-                import pickle
-                with open(new_model_path, 'wb') as f:
-                    pickle.dump(system.final_model, f)
-                logger.info(f"Nouveau modele sauvegarde: {new_model_path}")
-                
-                # Archiver ancien modèle si existe
-                if current_model_path and current_model_path != new_model_path:
-                    archive_path = f'archive_{current_model_path}'
-                    os.rename(current_model_path, archive_path)
-                    logger.info(f"Ancien modele archive: {archive_path}")
-                
-                # Créer lien symbolique pour le modèle de production
-                production_path = 'usualodds_model_basic.pkl'
-                if os.path.exists(production_path):
-                    os.remove(production_path)
-                
-                # Sur Windows, copier le fichier au lieu d'un lien symbolique
-                import shutil
-                shutil.copy2(new_model_path, production_path)
-                logger.info(f"Modele de production mis a jour: {production_path}")
-                
-                return True
-                
-            except Exception as e:
-                logger.error(f"Erreur sauvegarde nouveau modele: {e}")
-                return False
+            return deploy_model(system, current_model_path)
         else:
             logger.info("Conservation modele actuel")
             return True
@@ -150,6 +126,72 @@ def continuous_learning_pipeline(new_results_count: int = 0):
         logger.error(f"Erreur apprentissage continu: {e}")
         return False
 
+def incremental_learning_pipeline(system, current_model_path: str) -> bool:
+    """Mise à jour à chaud du modèle actuel avec les résultats depuis son watermark"""
+    logger.info("Mise a jour incrementale (warm start)...")
+    
+    report = system.run_incremental_update()
+    
+    if not report.get('updated'):
+        logger.info("Aucune mise a jour necessaire, conservation modele actuel")
+        return True
+    
+    logger.info(f"Nouveaux matches integres: {report['n_new_matches']}")
+    logger.info(f"Precision hors echantillon modele precedent: {report['holdout_accuracy']:.3f}")
+    logger.info(f"Mises a jour depuis derniere reconstruction: {report['incremental_updates']}")
+    
+    return deploy_model(system, current_model_path)
+
+def _archive_file(source: str, target: str):
+    """Archive un fichier sans le retirer de production (lien dur, copie à défaut)"""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def deploy_model(system, current_model_path: str) -> bool:
+    """Archive l'ancien modèle puis remplace atomiquement l'artefact de production"""
+    from ultra_sophisticated_ml_system import (ModelArtifactStore, MODEL_ARTIFACT_SUFFIX,
+                                               calibration_artifact_path)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    production_path = f'usualodds_model_basic{MODEL_ARTIFACT_SUFFIX}'
+    
+    try:
+        # Archiver ancien modèle (horodatage lu dans le manifeste, sans charger le modèle);
+        # il reste en place: un crash avant le remplacement laisse la production intacte
+        archived = []
+        if current_model_path and os.path.exists(current_model_path):
+            archive_path = f'archive_{current_model_path}'
+            if current_model_path.endswith(MODEL_ARTIFACT_SUFFIX):
+                previous = ModelArtifactStore.read_metadata(current_model_path).get('timestamp', timestamp)
+                archive_path = f'archive_usualodds_model_{previous}{MODEL_ARTIFACT_SUFFIX}'
+            archived.append((current_model_path, archive_path))
+            if os.path.exists(calibration_artifact_path(current_model_path)):
+                archived.append((calibration_artifact_path(current_model_path),
+                                 calibration_artifact_path(archive_path)))
+            for source, target in archived:
+                if os.path.exists(target):
+                    os.remove(target)
+                _archive_file(source, target)
+            logger.info(f"Ancien modele archive: {archive_path}")
+        
+        # Écriture atomique de l'artefact de production (fichier temporaire + os.replace)
+        system.save_model(production_path, timestamp)
+        logger.info(f"Modele de production mis a jour: {production_path}")
+        
+        # Ancien modèle sous un autre nom (pkl historique): retiré une fois le nouveau en place
+        if current_model_path and os.path.abspath(current_model_path) != os.path.abspath(production_path):
+            for source, _ in archived:
+                if os.path.exists(source):
+                    os.remove(source)
+        
+        return True
+        
+    except Exception as e:
+        logger.error(f"Erreur sauvegarde nouveau modele: {e}")
+        return False
+
 def evaluate_model_performance(system) -> float:
     """Évalue rapidement la performance du modèle actuel"""
     try:
@@ -170,49 +212,38 @@ def evaluate_model_performance(system) -> float:
             return 0.5  # Performance par défaut
         
         matches = response.data
-        correct_predictions = 0
-        total_predictions = 0
         
+        # Classes encodées de l'entraînement (LabelEncoder: away, draw, home)
+        classes = np.asarray((system.incremental_state or {}).get('target_classes') or ['away', 'draw', 'home'])
+        
+        rows, actuals = [], []
         for match in matches[:50]:  # Limite pour évaluation rapide
             try:
-                # Extraire features pour ce match
+                # Features as-of la date du match (aucune information postérieure)
                 home_features = system._extract_sophisticated_features(
-                    match['home_team_id'], f"Team_{match['home_team_id']}"
+                    match['home_team_id'], f"Team_{match['home_team_id']}", as_of=match['date']
                 )
                 away_features = system._extract_sophisticated_features(
-                    match['away_team_id'], f"Team_{match['away_team_id']}"
+                    match['away_team_id'], f"Team_{match['away_team_id']}", as_of=match['date']
                 )
                 
-                # Préparer features
-                match_features = system._prepare_match_features(home_features, away_features)
-                
-                # Prédiction
-                prediction = system.final_model.predict([match_features])[0]
+                # Préparer features (ligne nommée comme à l'entraînement)
+                rows.append(system._prepare_match_features(match, home_features, away_features))
                 
                 # Résultat réel
                 home_score = int(match['home_score'])
                 away_score = int(match['away_score'])
-                
-                if home_score > away_score:
-                    actual = 0  # home_win
-                elif away_score > home_score:
-                    actual = 2  # away_win  
-                else:
-                    actual = 1  # draw
-                
-                if prediction == actual:
-                    correct_predictions += 1
-                
-                total_predictions += 1
+                actuals.append('home' if home_score > away_score else 'away' if away_score > home_score else 'draw')
                 
             except Exception:
                 continue
         
-        if total_predictions > 0:
-            accuracy = correct_predictions / total_predictions
-            return accuracy
-        else:
+        if not rows:
             return 0.5
+        
+        # Prédiction en lot, mêmes colonnes que l'entraînement
+        predictions = system.final_model.predict(system._serving_matrix(rows))
+        return float(np.mean(classes[predictions.astype(int)] == np.asarray(actuals)))
             
     except Exception as e:
         logger.warning(f"Erreur evaluation performance: {e}")
@@ -225,6 +256,8 @@ def main():
                        help='Nombre de nouveaux résultats détectés')
     parser.add_argument('--force', action='store_true',
                        help='Force le re-entraînement même avec peu de données')
+    parser.add_argument('--full-rebuild', action='store_true',
+                       help='Reconstruction complète (job planifié) au lieu de la mise à jour incrémentale')
     
     args = parser.parse_args()
     
@@ -238,7 +271,10 @@ def main():
         if args.force:
             logger.info("Mode force active - re-entrainement force")
         
-        success = continuous_learning_pipeline(args.new_results)
+        if args.full_rebuild:
+            logger.info("Reconstruction complete du modele")
+        
+        success = continuous_learning_pipeline(args.new_results, full_rebuild=args.full_rebuild)
         
         print("\n" + "=" * 50)
         if success:
@@ -5,10 +5,16 @@ TEST INTEGRATION COTES BOOKMAKER
 Teste l'intégration des cotes sans dépendance réseau
 """
 
+import os
 import sys
 import logging
+import tempfile
+import numpy as np
+import pandas as pd
 from datetime import datetime
-from ultra_sophisticated_ml_system import UltraSophisticatedMLSystem, MLConfig
+from sklearn.ensemble import RandomForestClassifier
+from ultra_sophisticated_ml_system import (UltraSophisticatedMLSystem, MLConfig, FeaturePreprocessor, PreprocessedModel,
+                                           EloRatingEngine, HybridMLArchitecture, OPTUNA_AVAILABLE)
 
 # Configuration logging sans émojis
 logging.basicConfig(
@@ -59,26 +65,33 @@ def test_odds_features_extraction():
             'home_advantage': 0.0
         }
         
+        mock_match = {'id': 1, 'home_team_id': 10, 'away_team_id': 20, 'date': '2025-03-15T15:00:00'}
+        odds_columns = [
+            'implied_prob_home', 'implied_prob_draw', 'implied_prob_away',
+            'market_margin', 'odds_home_away_ratio', 'favorite_indicator',
+            'draw_likelihood', 'market_confidence'
+        ]
+        
         # Tester préparation features avec None (fallback aux cotes par défaut)
         logger.info("\n--- Test features avec fallback cotes ---")
-        features_with_fallback = system._prepare_match_features(mock_home_features, mock_away_features)
-        logger.info(f"Nombre features avec fallback: {len(features_with_fallback)}")
-        logger.info(f"Features equipes: {features_with_fallback[:16]}...")
-        logger.info(f"Features cotes fallback: {features_with_fallback[-8:]}")
+        features_with_fallback = system._prepare_match_features(mock_match, mock_home_features, mock_away_features)
+        logger.info(f"Nombre features avec fallback: {features_with_fallback.shape[1]}")
+        logger.info(f"Features cotes fallback: {features_with_fallback[odds_columns].iloc[0].tolist()}")
         
         # Tester préparation features avec cotes spécifiques
         logger.info("\n--- Test features avec cotes specifiques ---")
-        features_with_odds = system._prepare_match_features(mock_home_features, mock_away_features, mock_odds_features)
-        logger.info(f"Nombre features avec cotes: {len(features_with_odds)}")
-        logger.info(f"Features equipes: {features_with_odds[:16]}...")
-        logger.info(f"Features cotes specifiques: {features_with_odds[-8:]}")
+        features_with_odds = system._prepare_match_features(mock_match, mock_home_features, mock_away_features,
+                                                            mock_odds_features)
+        logger.info(f"Nombre features avec cotes: {features_with_odds.shape[1]}")
+        logger.info(f"Features cotes specifiques: {features_with_odds[odds_columns].iloc[0].tolist()}")
         
-        # Vérifier que les cotes sont intégrées
-        expected_total_features = 16 + 8  # 16 features équipes + 8 features cotes
+        # Vérifier que les cotes et les features équipe préfixées sont intégrées
+        team_columns = [f"{side}_team_{name}" for side in ('home', 'away') for name in mock_home_features]
+        expected_columns = team_columns + odds_columns
         
-        if (len(features_with_fallback) == expected_total_features and 
-            len(features_with_odds) == expected_total_features):
-            logger.info(f"SUCCES: Integration cotes correcte ({expected_total_features} features total)")
+        if all(col in frame.columns for frame in (features_with_fallback, features_with_odds)
+               for col in expected_columns):
+            logger.info(f"SUCCES: Integration cotes correcte ({len(expected_columns)} features equipes + cotes)")
             
             # Test calculs dérivés
             logger.info("\n--- Verification calculs derives ---")
@@ -94,9 +107,8 @@ def test_odds_features_extraction():
             
             return True
         else:
-            logger.error(f"ERREUR: Nombre incorrect de features")
-            logger.error(f"  Fallback: {len(features_with_fallback)} (attendu: {expected_total_features})")
-            logger.error(f"  Specifique: {len(features_with_odds)} (attendu: {expected_total_features})")
+            missing = [col for col in expected_columns if col not in features_with_odds.columns]
+            logger.error(f"ERREUR: Features manquantes: {missing}")
             return False
             
     except Exception as e:
@@ -133,6 +145,165 @@ def test_odds_extraction_fallback():
         logger.error(f"Erreur test fallback cotes: {e}")
         return False
 
+def make_training_matches(n_matches: int = 400, seed: int = 42) -> pd.DataFrame:
+    """Matches terminés synthétiques (20 équipes), format consolidé"""
+    rng = np.random.default_rng(seed)
+    home = rng.integers(1, 21, n_matches)
+    away = (home + rng.integers(1, 20, n_matches) - 1) % 20 + 1
+    home_score, away_score = rng.poisson(1.4, n_matches), rng.poisson(1.1, n_matches)
+    return pd.DataFrame({
+        'id': np.arange(n_matches),
+        'match_date': pd.date_range('2023-08-01', periods=n_matches, freq='D').strftime('%Y-%m-%dT%H:%M:%S'),
+        'home_team_id': home, 'away_team_id': away,
+        'home_score': home_score, 'away_score': away_score,
+        'home_xg': home_score + rng.normal(0, 0.5, n_matches), 'away_xg': away_score + rng.normal(0, 0.5, n_matches),
+        'result': np.where(home_score > away_score, 'home', np.where(home_score < away_score, 'away', 'draw'))
+    })
+
+def test_serving_matches_training_features():
+    """Test ligne servie: mêmes colonnes et même largeur que la matrice d'entraînement"""
+    
+    logger.info("\n=== TEST ALIGNEMENT FEATURES ENTRAINEMENT / SERVICE ===")
+    
+    try:
+        config = MLConfig()
+        system = UltraSophisticatedMLSystem(config)
+        engineer = system.feature_engineer
+        
+        # Matrice d'entraînement construite comme par le pipeline
+        data = engineer.create_temporal_features(make_training_matches())
+        data = engineer.create_interaction_features(data)
+        X = data.drop(columns=['result', 'match_id', 'home_team', 'away_team'], errors='ignore')
+        preprocessor = FeaturePreprocessor().fit(X)
+        model = RandomForestClassifier(n_estimators=20, random_state=42).fit(preprocessor.transform(X), data['result'])
+        system.final_model = PreprocessedModel(preprocessor, model)
+        
+        # Lignes servies pour deux matches à venir (équipe 99 sans historique), as-of la date du match
+        rows = []
+        for match in ({'id': 1000, 'home_team_id': 1, 'away_team_id': 2, 'date': '2030-01-05T15:00:00'},
+                      {'id': 1001, 'home_team_id': 3, 'away_team_id': 99, 'date': '2030-01-06T18:00:00'}):
+            home_features = system._extract_sophisticated_features(match['home_team_id'], 'home', as_of=match['date'])
+            away_features = system._extract_sophisticated_features(match['away_team_id'], 'away', as_of=match['date'])
+            rows.append(system._prepare_match_features(match, home_features, away_features))
+        served = system._serving_matrix(rows)
+        
+        training_columns = system.final_model.feature_names
+        logger.info(f"Features entrainement: {len(training_columns)}, features servies: {served.shape[1]}")
+        if list(served.columns) != training_columns:
+            logger.error("ERREUR: colonnes servies differentes de l'entrainement")
+            return False
+        
+        # Forme récente et Elo lus dans le store (pas de valeur par défaut)
+        for name in ('home_team_form_5', 'home_team_rest_days', 'home_team_elo_rating'):
+            if name in training_columns and pd.isna(served[name].iloc[0]):
+                logger.error(f"ERREUR: {name} non renseignee pour une equipe connue")
+                return False
+        
+        # Repos mesuré jusqu'à la date du match (et non jusqu'à maintenant)
+        last_home_match = pd.to_datetime(data.loc[(data['home_team_id'] == 1) | (data['away_team_id'] == 1),
+                                                  'match_date']).max()
+        expected_rest = (pd.Timestamp('2030-01-05T15:00:00') - last_home_match) / pd.Timedelta(days=1)
+        if 'home_team_rest_days' in training_columns and \
+                not np.isclose(served['home_team_rest_days'].iloc[0], expected_rest):
+            logger.error(f"ERREUR: repos {served['home_team_rest_days'].iloc[0]} au lieu de {expected_rest}")
+            return False
+        
+        # Équipe sans historique: NaN comme à l'entraînement, imputés par le préprocesseur
+        unknown = [name for name in ('away_team_form_5', 'away_team_rest_days') if name in training_columns]
+        if not served[unknown].iloc[1].isna().all():
+            logger.error(f"ERREUR: valeurs par defaut servies pour une equipe sans historique: {served[unknown].iloc[1]}")
+            return False
+        positions = [training_columns.index(name) for name in unknown]
+        imputed = preprocessor.scaler.inverse_transform(preprocessor.transform(served))[1, positions]
+        if not np.allclose(imputed, preprocessor.fill_values[positions], rtol=1e-4):
+            logger.error("ERREUR: imputation servie differente de l'entrainement")
+            return False
+        
+        proba = system.final_model.predict_proba(served)
+        
+        # Vecteur positionnel refusé (aucun alignement possible)
+        try:
+            system.final_model.predict_proba(served.to_numpy())
+            logger.error("ERREUR: vecteur positionnel accepte sans alignement")
+            return False
+        except ValueError:
+            pass
+        
+        logger.info(f"SUCCES: {len(proba)} lignes servies alignees ({served.shape[1]} features)")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Erreur test alignement features: {e}")
+        return False
+
+def test_elo_pending_match_updated_when_played():
+    """Test Elo: un match vu avant d'être joué est intégré à l'arrivée de son résultat"""
+    
+    logger.info("\n=== TEST ELO MATCH A VENIR PUIS TERMINE ===")
+    
+    try:
+        elo = EloRatingEngine()
+        
+        # Match à venir: aucune variation, rien de mémorisé
+        pending = elo.update(1, 2, np.nan, match_key=500)
+        if pending[2:] != pending[:2] or 500 in elo.match_ratings:
+            logger.error("ERREUR: match non joue integre ou memorise")
+            return False
+        
+        # Même match terminé (victoire domicile): les notes bougent
+        played = elo.update(1, 2, 1.0, match_key=500)
+        if not (played[2] > played[0] and played[3] < played[1]):
+            logger.error(f"ERREUR: resultat non integre {played}")
+            return False
+        
+        # Résultat rejoué: jamais recompté
+        if elo.update(1, 2, 1.0, match_key=500) != played or elo.rating(1) != played[2]:
+            logger.error("ERREUR: resultat compte deux fois")
+            return False
+        
+        logger.info(f"SUCCES: notes apres resultat {played[2]:.1f} / {played[3]:.1f}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Erreur test Elo: {e}")
+        return False
+
+def test_optuna_study_resumed():
+    """Test Auto-ML: une étude persistante relancée reprend les essais déjà terminés"""
+    
+    logger.info("\n=== TEST REPRISE ETUDE OPTUNA ===")
+    
+    if not OPTUNA_AVAILABLE:
+        logger.info("Optuna non disponible, test ignore")
+        return True
+    
+    try:
+        data = make_training_matches(n_matches=240)
+        X = data[['home_team_id', 'away_team_id', 'home_xg', 'away_xg']]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            for storage in (f"journal:{os.path.join(directory, 'optuna.journal')}",
+                            f"sqlite:///{os.path.join(directory, 'optuna.db')}"):
+                config = MLConfig(optuna_storage=storage, auto_ml_trials=3, cv_folds=2, cpu_budget=1)
+                first = HybridMLArchitecture(config).auto_ml_optimization(X, data['result'])
+                second = HybridMLArchitecture(config).auto_ml_optimization(X, data['result'])
+                
+                if first['resumed_trials'] != 0 or second['resumed_trials'] != config.auto_ml_trials:
+                    logger.error(f"ERREUR: reprise {storage.split(':')[0]}: "
+                                 f"{first['resumed_trials']} puis {second['resumed_trials']} essais repris")
+                    return False
+                if second['n_trials'] != config.auto_ml_trials or second['study_name'] != first['study_name']:
+                    logger.error(f"ERREUR: essais relances au lieu d'etre repris ({second['n_trials']})")
+                    return False
+                logger.info(f"Reprise {storage.split(':')[0]}: {second['resumed_trials']} essais repris")
+        
+        logger.info("SUCCES: etudes Optuna reprises (journal et SQLite)")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Erreur test reprise Optuna: {e}")
+        return False
+
 def main():
     """Test complet intégration cotes"""
     
@@ -142,7 +313,7 @@ def main():
     print()
     
     tests_passed = 0
-    total_tests = 2
+    total_tests = 5
     
     # Test 1: Extraction features
     if test_odds_features_extraction():
@@ -158,6 +329,27 @@ def main():
     else:
         logger.error("TEST 2: ECHEC")
     
+    # Test 3: Alignement entraînement / service
+    if test_serving_matches_training_features():
+        tests_passed += 1
+        logger.info("TEST 3: PASSE")
+    else:
+        logger.error("TEST 3: ECHEC")
+    
+    # Test 4: Elo d'un match à venir puis terminé
+    if test_elo_pending_match_updated_when_played():
+        tests_passed += 1
+        logger.info("TEST 4: PASSE")
+    else:
+        logger.error("TEST 4: ECHEC")
+    
+    # Test 5: Reprise d'une étude Optuna persistante
+    if test_optuna_study_resumed():
+        tests_passed += 1
+        logger.info("TEST 5: PASSE")
+    else:
+        logger.error("TEST 5: ECHEC")
+    
     print("\n" + "=" * 60)
     print("RESULTATS TESTS INTEGRATION COTES:")
     print(f"Tests reussis: {tests_passed}/{total_tests}")